@@ -1,46 +1,147 @@
 from prompt_toolkit import PromptSession, HTML
-import json
+import atexit
 import os
+import re
 
+from bisect import bisect_left
+from functools import lru_cache
 from prompt_toolkit.completion import Completer, Completion
-from logging import info
+from logging import info, warning
+
+# Support both running as a script from this directory and package imports
+try:
+    from .json_io import load_json, dump_json
+except ImportError:
+    from json_io import load_json, dump_json
+
+
+# Characters with a special meaning in a regex (outside of verbose mode)
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
 
 
 class CategoryManager:
     UNCATEGORIZED_ACCOUNT = 'Unspecified'
+    # Lookup file entries are [payee, type code] pairs
+    TYPE_CODES = {'regex': 'r', 'literal': 'l'}
 
     def __init__(self, lookup_file, categories_list):
         self.lookup_file = lookup_file
-        self.lookup_data = self.load_lookup_data()
         self.categories_list = categories_list
+        self.dirty = False
+        self.lookup_data = self.load_lookup_data()
+        # Each category's patterns as a set, for constant time duplicate checks
+        self.known_patterns = {
+            category: {payee for payee, _ in patterns}
+            for category, patterns in self.lookup_data.items()
+        }
+        self.matchers = self.compile_lookup_data()
+        # Categories whose patterns changed since they were last compiled
+        self.stale_categories = set()
 
     def load_lookup_data(self):
         if not os.path.exists(self.lookup_file):
             self.create_new_lookup_file()
 
-        with open(self.lookup_file, 'r') as file:
-            return json.load(file)
+        lookup_data = load_json(self.lookup_file)
+        self.migrate_lookup_data(lookup_data)
+        return lookup_data
+
+    def migrate_lookup_data(self, lookup_data):
+        '''
+        Convert entries in the old {"payee": ..., "type": ...} format to
+        [payee, type code] pairs in place, marking the data to be saved.
+        Entries with an unknown type are skipped with a warning.
+        '''
+        for category, patterns in lookup_data.items():
+            migrated = []
+            for entry in patterns:
+                if isinstance(entry, dict):
+                    type_code = CategoryManager.TYPE_CODES.get(entry.get('type'))
+                    if type_code is None or 'payee' not in entry:
+                        warning(f'Skipping lookup entry {entry} for {category}: unknown type.')
+                        continue
+                    entry = [entry['payee'], type_code]
+                    self.mark_dirty()
+                migrated.append(entry)
+            patterns[:] = migrated
 
     def create_new_lookup_file(self):
         category_lookup = {}
         for category in self.categories_list:
             category_lookup[category] = []
-        with open(self.lookup_file, 'w') as json_file:
-            json.dump(category_lookup, json_file, indent=4)
+        dump_json(category_lookup, self.lookup_file)
+
+    def compile_lookup_data(self):
+        '''
+        Compile the patterns of every category that has any into matchers.
+
+        Returns:
+            dict: category -> (literal_regex, substring_regex, regexes), in lookup
+            file order, which decides the category when several match.
+        '''
+        return {
+            category: compile_patterns(patterns)
+            for category, patterns in self.lookup_data.items()
+            if patterns
+        }
+
+    def get_matchers(self):
+        '''
+        Return the compiled matchers, first compiling the categories whose
+        patterns changed since the last call. Compiling lazily means a batch
+        of new patterns compiles each affected category once, and no others.
+
+        Returns:
+            dict: category -> (literal_regex, substring_regex, regexes), in lookup
+            file order.
+        '''
+        if self.stale_categories:
+            added = False
+            for category in self.stale_categories:
+                added = added or category not in self.matchers
+                self.matchers[category] = compile_patterns(self.lookup_data[category])
+            if added:
+                # Move new categories to their lookup file position
+                self.matchers = {
+                    category: self.matchers[category]
+                    for category in self.lookup_data
+                    if category in self.matchers
+                }
+            self.stale_categories.clear()
+        return self.matchers
 
     def update_lookup(self, category, pattern, match_type):
-        if category not in self.lookup_data:
-            self.lookup_data[category] = []
+        known_patterns = self.known_patterns.setdefault(category, set())
+        if pattern not in known_patterns:
+            known_patterns.add(pattern)
+            self.lookup_data.setdefault(category, []).append(
+                [pattern, CategoryManager.TYPE_CODES[match_type]]
+            )
+            self.stale_categories.add(category)
+            self.mark_dirty()
+            info(f'Added {match_type} pattern: [{pattern}] for category: {category}')
 
-        exists = any(entry['payee'] == pattern for entry in self.lookup_data[category])
-        if not exists:
-            self.lookup_data[category].append({'payee': pattern, 'type': match_type})
+    def mark_dirty(self):
+        '''
+        Mark the lookup data as changed since it was last saved, registering
+        flush() to run at exit until it has been saved.
+        '''
+        if not self.dirty:
+            self.dirty = True
+            atexit.register(self.flush)
+
+    def flush(self):
+        '''
+        Save the lookup data if it changed since it was last saved. Safe to
+        call more than once.
+        '''
+        if self.dirty:
             self.save_lookup_data()
-            info(f'Added {match_type} pattern: [{pattern}] for category: {category}')
+            self.dirty = False
+            atexit.unregister(self.flush)
 
     def save_lookup_data(self):
-        with open(self.lookup_file, 'w') as file:
-            json.dump(self.lookup_data, file, indent=4)
+        dump_json(self.lookup_data, self.lookup_file)
         info(f'Lookup file updated: {self.lookup_file}')
 
     def category_prompt(self):
@@ -67,6 +168,94 @@ class CategoryManager:
         return PromptSession(message=pattern_prompt_message)
 
 
+def compile_patterns(patterns):
+    '''
+    Compile a category's patterns into a single regex for all of its literals,
+    a single regex for the regex patterns that are plain strings (either is
+    None if there are no such patterns), and one regex per remaining regex
+    pattern.
+
+    The literals are lowercased here, so the literal regex is meant to be
+    searched against the lowercased payee, giving case insensitive matching
+    without re.IGNORECASE. Plain string regex patterns stay case sensitive, and
+    combining them lets one search stand in for a substring test per pattern.
+
+    Args:
+        patterns (list): The category's [payee, type code] entries.
+
+    Returns:
+        tuple: (literal_regex, substring_regex, regexes)
+    '''
+    literals = [payee.lower() for payee, type_code in patterns if type_code == 'l']
+    literal_regex = re.compile(trie_regex(literals)) if literals else None
+    regex_patterns = [payee for payee, type_code in patterns if type_code == 'r']
+    substrings = [pattern for pattern in regex_patterns if is_plain_string(pattern)]
+    substring_regex = re.compile(trie_regex(substrings)) if substrings else None
+    regexes = [
+        compile_regex(pattern) for pattern in regex_patterns if not is_plain_string(pattern)
+    ]
+    return literal_regex, substring_regex, regexes
+
+
+def is_plain_string(pattern):
+    '''
+    Check whether a regex pattern has no metacharacters, i.e. it only matches
+    itself and can be matched as a literal string.
+
+    Args:
+        pattern (str): The regex source.
+
+    Returns:
+        bool: True if the pattern is a plain string.
+    '''
+    return REGEX_METACHARACTERS.isdisjoint(pattern)
+
+
+@lru_cache(maxsize=None)
+def compile_regex(pattern):
+    '''
+    Compile a regex pattern, reusing the compiled object for repeat patterns.
+
+    Args:
+        pattern (str): The regex source.
+
+    Returns:
+        re.Pattern: The compiled regex.
+    '''
+    return re.compile(pattern)
+
+
+def trie_regex(literals):
+    '''
+    Build a regex source string that matches any of the given literals, with
+    common prefixes merged (e.g. "ab(?:c|d)") so each is only tried once.
+
+    Args:
+        literals (list): Strings to match.
+
+    Returns:
+        str: The regex source.
+    '''
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = None
+    return _trie_node_regex(trie)
+
+
+def _trie_node_regex(node):
+    # Only whether some literal occurs matters, so a literal that is a prefix
+    # of longer ones makes the longer ones redundant.
+    if '' in node:
+        return ''
+    branches = [re.escape(char) + _trie_node_regex(child) for char, child in node.items()]
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
 # Custom completer for hierarchical categories
 class CategoryCompleter(Completer):
     '''
@@ -77,8 +266,9 @@ class CategoryCompleter(Completer):
     '''
 
     def __init__(self, categories):
-        self.categories = categories
-        self.categories.sort()
+        # (lowercased, original) pairs, sorted so that the categories sharing a
+        # prefix are adjacent and can be found with a binary search
+        self.sorted_categories = sorted((category.lower(), category) for category in categories)
 
     def get_completions(self, document, complete_event):
         '''
@@ -92,6 +282,7 @@ class CategoryCompleter(Completer):
             Completion: A completion suggestion for the input.
         '''
         text = document.text_before_cursor.lower()
-        for category in self.categories:
-            if category.lower().startswith(text):
-                yield Completion(category, start_position=-len(text))
+        i = bisect_left(self.sorted_categories, (text,))
+        while i < len(self.sorted_categories) and self.sorted_categories[i][0].startswith(text):
+            yield Completion(self.sorted_categories[i][1], start_position=-len(text))
+            i += 1
@@ -1,6 +1,18 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine, text
 
+HEADER = (
+    'account_code',
+    'fullname',
+    'name',
+    'parent_name',
+    'parent_code',
+    'account_type',
+    'description',
+    'hidden',
+    'placeholder',
+)
+
 query = '''
 WITH RECURSIVE account_hierarchy AS (
     --------------------------------------------------------------------
@@ -12,8 +24,9 @@ WITH RECURSIVE account_hierarchy AS (
         -- Append '0' if code < 5 chars
         CASE WHEN length(code) < 5 THEN code || '0' ELSE code END AS child_code,
 
-        -- Root's fullname is just its own name (no parent)
-        name AS fullname,
+        -- Root's fullname is just its own name (no parent), except for
+        -- 'Root Account', which is left out of its descendants' fullnames
+        CASE WHEN name = 'Root Account' THEN '' ELSE name END AS fullname,
 
         -- The row’s own name and code
         name AS name,
@@ -40,7 +53,11 @@ WITH RECURSIVE account_hierarchy AS (
         CASE WHEN length(child.code) < 5 THEN child.code || '0' ELSE child.code END AS child_code,
 
         -- Build a deeper fullname by appending the child's name
-        parent.fullname || ':' || child.name AS fullname,
+        CASE
+          WHEN parent.fullname = ''
+          THEN child.name
+          ELSE parent.fullname || ':' || child.name
+        END AS fullname,
 
         -- The child's own name/code
         child.name,
@@ -62,8 +79,9 @@ SELECT
     -- The child code from the CTE (already has '0' appended if short)
     account_hierarchy.child_code,
 
-    -- The full hierarchical path (e.g., "grandparent:parent:child")
-    account_hierarchy.fullname,
+    -- The full hierarchical path (e.g., "grandparent:parent:child"); the
+    -- 'Root Account' row itself keeps its name
+    COALESCE(NULLIF(account_hierarchy.fullname, ''), account_hierarchy.name) AS fullname,
 
     -- Child’s name
     account_hierarchy.name,
@@ -97,36 +115,11 @@ ORDER BY CAST(account_hierarchy.child_code AS INTEGER) ASC;
 
 def export_gnucash_accounts(db_url: str) -> list:
     engine = create_engine(db_url, echo=False)
-    accounts = []
     with Session(engine) as session:
 
         sql_query = text(query)
 
-        result = session.execute(sql_query)
-
-        accounts.append(
-            'account_code',
-            'fullname',
-            'name',
-            'parent_name',
-            'parent_code',
-            'account_type',
-            'description',
-            'hidden',
-            'placeholder',
-        )
-
-        for row in result:
-            fullname = row.fullname.removeprefix('Root Account:')
-            accounts.append(
-                row.child_code,
-                fullname,
-                row.name,
-                row.parent_name,
-                row.parent_code,
-                row.account_type,
-                row.description,
-                row.hidden,
-                row.placeholder,
-            )
-        return accounts
+        rows = session.execute(sql_query).all()
+
+        # The query selects its columns in HEADER order, so copy rows by position
+        return [HEADER, *(tuple(row) for row in rows)]
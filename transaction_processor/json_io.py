@@ -0,0 +1,38 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    '''
+    Parse a JSON file, using orjson when it is installed.
+
+    Args:
+        path (str): Path to the JSON file.
+
+    Returns:
+        The parsed JSON data.
+    '''
+    with open(path, 'rb') as file:
+        data = file.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def dump_json(data, path):
+    '''
+    Write data to a JSON file indented by two spaces, using orjson when it is
+    installed. Both backends produce the same output.
+
+    Args:
+        data: The data to serialize.
+        path (str): Path to the JSON file.
+    '''
+    if orjson:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(data, indent=2, ensure_ascii=False).encode()
+    with open(path, 'wb') as file:
+        file.write(encoded)
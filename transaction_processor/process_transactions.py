@@ -1,18 +1,25 @@
 import argparse
-import re
 import csv
 from os import makedirs
 from shutil import copyfile
-from json import load
-from datetime import datetime
+from datetime import date, datetime
+from operator import itemgetter
 from logging import INFO, DEBUG, info, debug, warning, basicConfig
-from qif_parser import QIFParser
-from category_manager import CategoryManager
-from export_accounts import export_gnucash_accounts
+
+# Support both running as a script from this directory and package imports
+try:
+    from .qif_parser import QIFParser, Transaction
+    from .category_manager import CategoryManager, compile_regex
+    from .json_io import load_json
+    from .export_accounts import export_gnucash_accounts
+except ImportError:
+    from qif_parser import QIFParser, Transaction
+    from category_manager import CategoryManager, compile_regex
+    from json_io import load_json
+    from export_accounts import export_gnucash_accounts
 
 
 # Constants
-QIF_DATE_FORMAT = '%m/%d/%Y'
 DATE_FIELD = 'date'
 DEFAULT_ACCOUNT_CONFIG = 'etc/account-config.json'
 DEFAULT_LOOKUP_FILE = 'etc/category-payee-lookup.json'
@@ -39,14 +46,45 @@ def read_transactions_from_csv(file_path: str, date_idx: int) -> tuple:
     with open(file_path) as csvfile:
         reader = csv.reader(csvfile)
         next(reader, None)  # Skip header row
-        sorted_transactions = sorted(
-            reader, key=lambda row: datetime.strptime(row[date_idx], QIF_DATE_FORMAT).date()
-        )
-        if sorted_transactions:
-            start_date = datetime.strptime(sorted_transactions[0][date_idx], QIF_DATE_FORMAT).date()
-            end_date = datetime.strptime(sorted_transactions[-1][date_idx], QIF_DATE_FORMAT).date()
-            return sorted_transactions, {'start': start_date, 'end': end_date}
+        # Parse (and so validate) each row's date once, as it is read
+        keyed = [(parse_qif_date(row[date_idx]), row) for row in reader]
+    if not keyed:
         return [], {'start': None, 'end': None}
+    keyed.sort(key=itemgetter(0))
+    sorted_transactions = [row for _, row in keyed]
+    return sorted_transactions, {'start': keyed[0][0], 'end': keyed[-1][0]}
+
+
+def parse_qif_date(date_string: str) -> date:
+    '''
+    Parse a date in MM/DD/YYYY format (month and day need not be zero padded).
+
+    Splitting on '/' is much cheaper than datetime.strptime, which matters
+    when parsing every row of a large CSV file.
+
+    Parameters:
+    - date_string (str): A date string in MM/DD/YYYY format.
+
+    Returns:
+    - date: The parsed date.
+
+    Raises:
+    - ValueError: If the string is not a valid MM/DD/YYYY date. This accepts
+      the same inputs as strptime('%m/%d/%Y'): the year must have exactly four
+      digits, and a single-digit day may be padded with a space ('9/ 2/2023'),
+      but the month and year may not.
+    '''
+    month, day, year = date_string.split('/', 2)
+    if len(day) == 2 and day[0] == ' ':
+        day = day[1]
+    if not (
+        len(year) == 4
+        and 1 <= len(month) <= 2
+        and 1 <= len(day) <= 2
+        and f'{month}{day}{year}'.isdigit()
+    ):
+        raise ValueError(f"date '{date_string}' does not match format MM/DD/YYYY")
+    return date(int(year), int(month), int(day))
 
 
 def get_gnucash_accounts(db_path: str) -> list:
@@ -54,26 +92,24 @@ def get_gnucash_accounts(db_path: str) -> list:
     return [account[1] for account in accounts]
 
 
-def categorize_transaction(payee: str, lookup: dict) -> str:
+def categorize_transaction(payee: str, category_manager: CategoryManager) -> str:
     if not payee.strip():
         return None
-    for category, patterns in lookup.items():
-        if any(match_pattern(entry, payee) for entry in patterns):
+    payee_lc = payee.lower()
+    matchers = category_manager.get_matchers()
+    for category, (literal_regex, substring_regex, regexes) in matchers.items():
+        if (
+            (literal_regex and literal_regex.search(payee_lc))
+            or (substring_regex and substring_regex.search(payee))
+            or any(regex.search(payee) for regex in regexes)
+        ):
             debug(f'Matched payee "{payee}" to category "{category}"')
             return category
     debug(f'No pattern matched for payee: "{payee}"')
     return None
 
 
-def match_pattern(pattern: dict, payee: str) -> bool:
-    if pattern['type'] == 'regex':
-        return re.search(pattern['payee'], payee) is not None
-    elif pattern['type'] == 'literal':
-        return pattern['payee'].lower() in payee.lower()
-    return False
-
-
-def handle_uncategorized(transaction: dict, category_manager: CategoryManager) -> str:
+def handle_uncategorized(transaction: Transaction, category_manager: CategoryManager) -> str:
     print('_' * 50)
     print(QIFParser.pretty_format(transaction))
     category = collect_category(category_manager)
@@ -104,7 +140,7 @@ def collect_pattern(payee: str, category_manager: CategoryManager) -> tuple:
             return None, None
         if pattern_input.startswith('/') and pattern_input.endswith('/'):
             pattern = pattern_input[1:-1]
-            if re.search(pattern, payee):
+            if compile_regex(pattern).search(payee):
                 info(f'Confirmed that regex [{pattern}] matches the given payee {payee}')
                 return pattern, 'regex'
         else:
@@ -117,9 +153,9 @@ def collect_pattern(payee: str, category_manager: CategoryManager) -> tuple:
 def process_transactions(qif_file: QIFParser, category_manager: CategoryManager) -> None:
     for transaction in qif_file.transactions:
         payee = QIFParser.payee(transaction)
-        category = categorize_transaction(
-            payee, category_manager.lookup_data
-        ) or handle_uncategorized(transaction, category_manager)
+        category = categorize_transaction(payee, category_manager) or handle_uncategorized(
+            transaction, category_manager
+        )
         if category:
             QIFParser.categorize(transaction, category)
 
@@ -134,11 +170,7 @@ def format_date(date_string: str) -> str:
     Returns:
     - str: The date string in YYYY-MM-DD format.
     '''
-    # Split the input date string into components
-    month, day, year = date_string.split("/")
-    # Rearrange and format as YYYY-MM-DD
-    formatted_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-    return formatted_date
+    return parse_qif_date(date_string).isoformat()
 
 
 def main(
@@ -148,7 +180,7 @@ def main(
     lookup_file: str,
     database_file: str,
 ) -> None:
-    account_config = load(open(account_config_path))[account_name]
+    account_config = load_json(account_config_path)[account_name]
     transactions, date_range = read_transactions_from_csv(
         input_csv_file, account_config['colspec']['date']
     )
@@ -159,6 +191,7 @@ def main(
     qif_parser = QIFParser()
     qif_parser.init_from_csv(transactions, acct_cfg=account_config)
     process_transactions(qif_parser, category_manager)
+    category_manager.flush()
     qif_output_file = get_output_filename(account_name, date_range, 'qif')
     qif_parser.write(qif_output_file)
     info(f'Categorized transactions saved to: {qif_output_file}')
@@ -1,5 +1,4 @@
-from collections import OrderedDict
-
+HeaderMarker = '!'
 AcctHeader = '!Account'
 AcctName = 'N'
 AcctType = 'T'
@@ -13,13 +12,33 @@ TxnCategory = 'L'
 RecordEnd = '^'
 
 
+class Transaction:
+    """
+    A single QIF transaction, with a slot for each field named by its QIF code
+    (e.g. txn.D is the date). Fields missing from the source are None, and the
+    RecordEnd marker is implied.
+    """
+
+    __slots__ = (RecordBegin, TxnDate, TxnCheckNumber, TxnPayee, TxnAmount, TxnCategory)
+
+    def __init__(self, C=None, D=None, N=None, P=None, T=None, L=None):
+        self.C = C
+        self.D = D
+        self.N = N
+        self.P = P
+        self.T = T
+        self.L = L
+
+
 class QIFParser:
+    # Order in which transaction fields are written; RecordEnd always follows
+    FIELD_ORDER = (RecordBegin, TxnDate, TxnCheckNumber, TxnPayee, TxnAmount, TxnCategory)
 
     def __init__(self):
         """
         Initialize the QIF parser.
         """
-        self.account_info = OrderedDict()
+        self.account_info = {}
         self.transactions = []
         self.transaction_type = None
 
@@ -30,34 +49,40 @@ class QIFParser:
         Raises:
             ValueError: If the file format is invalid.
         """
+        # Read the file in one go rather than line by line
         with open(qif_file, 'r') as file:
-            current_transaction = OrderedDict()
-            for line in file:
-                line = line.strip()
-                if not line:
-                    continue
-
+            lines = file.read().split('\n')
+
+        in_account_section = False
+        current_transaction = Transaction()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # Branch on the first character: field lines, by far the most
+            # common, then cost a single comparison
+            line_type = line[0]
+            if line_type == HeaderMarker:
                 if line == AcctHeader:
                     in_account_section = True
-                    self.account_info = OrderedDict()
+                    self.account_info = {}
                     self.account_info[line] = ''
                 elif line.startswith(TxnHeader):
                     self.transaction_type = line.split(':')[1]
-                elif line == RecordEnd:  # end of section or transaction
-                    if in_account_section:
-                        self.account_info[RecordEnd] = ''
-                        in_account_section = False
-                    else:
-                        current_transaction[RecordEnd] = ''
-                        self.transactions.append(current_transaction)
-                        current_transaction = OrderedDict()
+            elif line == RecordEnd:  # end of section or transaction
+                if in_account_section:
+                    self.account_info[RecordEnd] = ''
+                    in_account_section = False
                 else:
-                    line_type = line[0]
-                    line_data = line[1:].strip()
-                    if in_account_section:
-                        self.account_info[line_type] = line_data
-                    else:
-                        current_transaction[line_type] = line_data
+                    self.transactions.append(current_transaction)
+                    current_transaction = Transaction()
+            else:
+                line_data = line[1:].strip()
+                if in_account_section:
+                    self.account_info[line_type] = line_data
+                elif line_type in Transaction.__slots__:
+                    setattr(current_transaction, line_type, line_data)
 
     def init_from_csv(self, csv_input, acct_cfg):
         self.account_info[AcctHeader] = ''
@@ -67,14 +92,14 @@ class QIFParser:
         self.transaction_type = acct_cfg['account-type']
 
         for t in csv_input:
-            txn = OrderedDict()
-            txn[RecordBegin] = ''
-            txn[TxnDate] = t[acct_cfg['colspec']['date']]
-            txn[TxnCheckNumber] = 'N/A'
-            txn[TxnPayee] = t[acct_cfg['colspec']['name']]
-            txn[TxnAmount] = t[acct_cfg['colspec']['amount']]
-            txn[TxnCategory] = ''
-            txn[RecordEnd] = ''
+            txn = Transaction(
+                C='',
+                D=t[acct_cfg['colspec']['date']],
+                N='N/A',
+                P=t[acct_cfg['colspec']['name']],
+                T=t[acct_cfg['colspec']['amount']],
+                L='',
+            )
             self.transactions.append(txn)
 
     def write(self, output_file):
@@ -84,40 +109,31 @@ class QIFParser:
         Args:
             output_file: File to write QIF data to.
         """
+        lines = [f'{key}{value}\n' for key, value in self.account_info.items()]
+        lines.append(f'!Type:{self.transaction_type}\n')
+        for transaction in self.transactions:
+            for field in QIFParser.FIELD_ORDER:
+                value = getattr(transaction, field)
+                if value is not None:
+                    lines.append(f'{field}{value}\n')
+            lines.append(f'{RecordEnd}\n')
+
+        # Build the whole file in memory and write it out in one call
         with open(output_file, 'w') as output:
-            for key in self.account_info.keys():
-                output.write(f'{key}{self.account_info[key]}\n')
-
-            output.write(f'!Type:{self.transaction_type}\n')
-
-            for transaction in self.transactions:
-                for key, value in self.sort_transaction(transaction).items():
-                    output.write(f'{key}{value}\n')
-
-    @classmethod
-    def sort_transaction(cls, txn):
-        field_order = [
-            RecordBegin,
-            TxnDate,
-            TxnCheckNumber,
-            TxnPayee,
-            TxnAmount,
-            TxnCategory,
-            RecordEnd,
-        ]
-        return OrderedDict((field, txn[field]) for field in field_order if field in txn)
+            output.write(''.join(lines))
 
     @classmethod
     def pretty_format(cls, txn):
         formatted = ''
-        for key, val in txn.items():
-            if key not in (RecordBegin, TxnCheckNumber, RecordEnd):
+        fields = ((TxnDate, txn.D), (TxnPayee, txn.P), (TxnAmount, txn.T), (TxnCategory, txn.L))
+        for key, val in fields:
+            if val is not None:
                 formatted += f'{key}: {val}\n'
         return formatted
 
     @classmethod
     def payee(cls, transaction):
-        return transaction.get(TxnPayee)
+        return transaction.P
 
     @classmethod
     def account(cls, qif_file):
@@ -125,15 +141,15 @@ class QIFParser:
 
     @classmethod
     def txn_date(cls, transaction):
-        return transaction.get(TxnDate)
+        return transaction.D
 
     @classmethod
     def amount(cls, transaction):
-        return transaction.get(TxnAmount)
+        return transaction.T
 
     @classmethod
     def category(cls, transaction):
-        return transaction.get(TxnCategory)
+        return transaction.L
 
     @classmethod
     def categorize(cls, transaction, category):
@@ -141,7 +157,7 @@ class QIFParser:
         Add or update the category (L field) in a transaction.
 
         Args:
-            transaction (OrderedDict): The transaction to modify.
+            transaction (Transaction): The transaction to modify.
             category (str): The category to add or update.
         """
-        transaction[TxnCategory] = category
+        transaction.L = category
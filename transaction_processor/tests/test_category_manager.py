@@ -0,0 +1,238 @@
+import json
+import re
+import pytest
+from prompt_toolkit.document import Document
+from transaction_processor.category_manager import (
+    CategoryCompleter,
+    CategoryManager,
+    compile_patterns,
+    is_plain_string,
+    trie_regex,
+)
+
+
+@pytest.fixture
+def lookup_file(tmp_path):
+    """
+    Fixture to provide a lookup file in the current [payee, type code] format.
+    """
+    path = tmp_path / "lookup.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Assets": [],
+                "Assets:Cash": [["ATM WITHDRAWAL", "l"]],
+                "Expenses:Groceries": [["^Grocery store #[0-9]+$", "r"], ["Market", "r"]],
+                "Expenses:Coffee": [["coffee", "l"]],
+            }
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def category_manager(lookup_file):
+    return CategoryManager(str(lookup_file), ["Assets", "Assets:Cash", "Expenses:Groceries"])
+
+
+def test_trie_regex_merges_common_prefixes():
+    assert trie_regex(["abc", "abd"]) == "ab(?:c|d)"
+    assert trie_regex(["abc", "abd", "x"]) == "(?:ab(?:c|d)|x)"
+
+
+def test_trie_regex_drops_literals_extended_from_shorter_ones():
+    assert trie_regex(["ab", "abc", "abd"]) == "ab"
+
+
+def test_trie_regex_empty_literal_matches_everything():
+    assert trie_regex(["", "abc"]) == ""
+    assert re.search(trie_regex(["", "abc"]), "anything")
+
+
+def test_trie_regex_escapes_metacharacters():
+    regex = re.compile(trie_regex(["x.y", "a+b"]))
+    assert regex.search("pay x.y now")
+    assert regex.search("a+b")
+    assert not regex.search("xzy")
+    assert not regex.search("aab")
+
+
+def test_literals_match_case_insensitively():
+    literal_regex, substring_regex, regexes = compile_patterns([["Coffee SHOP", "l"]])
+    assert substring_regex is None
+    assert regexes == []
+    assert literal_regex.search("MY COFFEE SHOP #12".lower())
+    assert not literal_regex.search("coffee bar")
+
+
+def test_non_ascii_literals_match_case_insensitively():
+    literal_regex, _, _ = compile_patterns([["Café ÉCLAIR", "l"], ["Straße", "l"]])
+    assert literal_regex.search("CAFÉ éclair paris".lower())
+    assert literal_regex.search("STRASSE".lower()) is None
+    assert literal_regex.search("Straße 12".lower())
+
+
+def test_regexes_are_compiled_per_pattern():
+    _, _, regexes = compile_patterns([["^Grocery #[0-9]+$", "r"], ["^A.*Z$", "r"]])
+    assert [regex.pattern for regex in regexes] == ["^Grocery #[0-9]+$", "^A.*Z$"]
+
+
+def test_is_plain_string():
+    assert is_plain_string("Grocery Store #1-2")
+    assert not is_plain_string("^Grocery")
+    assert not is_plain_string("a.b")
+    assert not is_plain_string("a\\d")
+    assert not is_plain_string("(a|b)")
+
+
+def test_plain_string_regexes_are_not_compiled_as_regexes():
+    _, substring_regex, regexes = compile_patterns([["Shell Oil", "r"], ["^A.*Z$", "r"]])
+    assert substring_regex.search("my Shell Oil 12")
+    assert [regex.pattern for regex in regexes] == ["^A.*Z$"]
+
+
+def test_plain_string_regexes_share_one_case_sensitive_regex():
+    literal_regex, substring_regex, regexes = compile_patterns(
+        [["Shell Oil", "r"], ["Shell Gas", "r"], ["Market", "r"]]
+    )
+    assert literal_regex is None
+    assert regexes == []
+    assert substring_regex.pattern == "(?:Shell\\ (?:Oil|Gas)|Market)"
+    assert substring_regex.search("my Shell Gas 12")
+    assert substring_regex.search("Farmers Market")
+    assert not substring_regex.search("SHELL OIL")
+
+
+def test_matchers_skip_categories_without_patterns(category_manager):
+    assert list(category_manager.get_matchers()) == [
+        "Assets:Cash",
+        "Expenses:Groceries",
+        "Expenses:Coffee",
+    ]
+
+
+def test_migrate_old_entries(tmp_path):
+    path = tmp_path / "lookup.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Assets:Cash": [{"payee": "ATM WITHDRAWAL", "type": "literal"}],
+                "Expenses:Groceries": [{"payee": "^Grocery #[0-9]+$", "type": "regex"}],
+            }
+        )
+    )
+    manager = CategoryManager(str(path), [])
+    assert manager.lookup_data == {
+        "Assets:Cash": [["ATM WITHDRAWAL", "l"]],
+        "Expenses:Groceries": [["^Grocery #[0-9]+$", "r"]],
+    }
+    assert manager.dirty
+
+    manager.flush()
+    assert not manager.dirty
+    assert json.loads(path.read_text()) == manager.lookup_data
+
+
+def test_migrate_skips_entries_with_unknown_types(tmp_path, caplog):
+    path = tmp_path / "lookup.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Assets:Cash": [
+                    {"payee": "ATM WITHDRAWAL", "type": "Literal"},
+                    {"payee": "cash back", "type": "literal"},
+                ],
+                "Expenses:Coffee": [["coffee", "l"]],
+            }
+        )
+    )
+    manager = CategoryManager(str(path), [])
+    assert manager.lookup_data == {
+        "Assets:Cash": [["cash back", "l"]],
+        "Expenses:Coffee": [["coffee", "l"]],
+    }
+    assert "ATM WITHDRAWAL" in caplog.text
+
+
+def test_current_entries_are_not_migrated(category_manager):
+    assert not category_manager.dirty
+
+
+def test_update_lookup_ignores_duplicates(category_manager):
+    category_manager.update_lookup("Assets:Cash", "ATM WITHDRAWAL", "regex")
+    assert category_manager.lookup_data["Assets:Cash"] == [["ATM WITHDRAWAL", "l"]]
+    assert not category_manager.dirty
+
+
+def test_update_lookup_keeps_lookup_file_order(category_manager):
+    category_manager.update_lookup("Expenses:Gas", "shell", "literal")
+    category_manager.update_lookup("Assets", "transfer", "literal")
+    category_manager.update_lookup("Assets:Cash", "cash back", "literal")
+    matchers = category_manager.get_matchers()
+    assert list(matchers) == [
+        "Assets",
+        "Assets:Cash",
+        "Expenses:Groceries",
+        "Expenses:Coffee",
+        "Expenses:Gas",
+    ]
+    assert matchers["Assets:Cash"][0].search("atm withdrawal")
+    assert matchers["Assets:Cash"][0].search("cash back")
+    assert category_manager.dirty
+
+
+def test_flush_saves_new_patterns(category_manager, lookup_file):
+    category_manager.update_lookup("Assets", "transfer", "literal")
+    assert category_manager.dirty
+    category_manager.flush()
+    assert not category_manager.dirty
+    assert json.loads(lookup_file.read_text())["Assets"] == [["transfer", "l"]]
+    assert CategoryManager(str(lookup_file), []).lookup_data["Assets"] == [["transfer", "l"]]
+
+
+def test_managers_do_not_share_unsaved_patterns(lookup_file):
+    first = CategoryManager(str(lookup_file), [])
+    first.update_lookup("Assets", "transfer", "literal")
+    second = CategoryManager(str(lookup_file), [])
+    assert second.lookup_data is not first.lookup_data
+    assert second.lookup_data["Assets"] == []
+    assert not second.dirty
+
+
+def test_create_new_lookup_file(tmp_path):
+    path = tmp_path / "new-lookup.json"
+    manager = CategoryManager(str(path), ["Assets", "Expenses"])
+    assert manager.lookup_data == {"Assets": [], "Expenses": []}
+    assert json.loads(path.read_text()) == {"Assets": [], "Expenses": []}
+
+
+def completions(completer, text):
+    return [completion.text for completion in completer.get_completions(Document(text), None)]
+
+
+def test_completer_matches_prefix_case_insensitively():
+    completer = CategoryCompleter(
+        ["Expenses:Food", "Assets:Cash", "Expenses", "assets:Bank", "Income", "Exp"]
+    )
+    assert completions(completer, "exp") == ["Exp", "Expenses", "Expenses:Food"]
+    assert completions(completer, "ASSETS") == ["assets:Bank", "Assets:Cash"]
+    assert completions(completer, "") == [
+        "assets:Bank",
+        "Assets:Cash",
+        "Exp",
+        "Expenses",
+        "Expenses:Food",
+        "Income",
+    ]
+
+
+def test_completer_without_matches():
+    completer = CategoryCompleter(["Assets", "Expenses"])
+    assert completions(completer, "zz") == []
+    assert completions(completer, "assets:") == []
+
+
+def test_completer_start_position():
+    completer = CategoryCompleter(["Expenses:Food"])
+    completion = next(completer.get_completions(Document("expen"), None))
+    assert completion.start_position == -5
@@ -0,0 +1,78 @@
+import sqlite3
+import pytest
+from transaction_processor.export_accounts import HEADER, export_gnucash_accounts
+
+ACCOUNT_COLUMNS = (
+    'guid',
+    'name',
+    'account_type',
+    'parent_guid',
+    'code',
+    'description',
+    'hidden',
+    'placeholder',
+)
+
+ACCOUNTS = [
+    ('root', 'Root Account', 'ROOT', None, '', '', 0, 0),
+    ('assets', 'Assets', 'ASSET', 'root', '1000', 'All assets', 0, 1),
+    ('cash', 'Cash', 'CASH', 'assets', '1100', '', 0, 0),
+    ('old', 'Old Account', 'ASSET', 'assets', '1200', '', 1, 0),
+    ('expenses', 'Expenses', 'EXPENSE', 'root', '5000', '', 0, 1),
+    ('groceries', 'Groceries', 'EXPENSE', 'expenses', '510', 'Food', 0, 0),
+]
+
+
+def create_accounts_db(path, accounts):
+    connection = sqlite3.connect(path)
+    connection.execute(f'CREATE TABLE accounts ({", ".join(ACCOUNT_COLUMNS)})')
+    connection.executemany(
+        f'INSERT INTO accounts VALUES ({", ".join("?" * len(ACCOUNT_COLUMNS))})', accounts
+    )
+    connection.commit()
+    connection.close()
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    path = tmp_path / 'accounts.gnucash'
+    create_accounts_db(path, ACCOUNTS)
+    return f'sqlite:///{path}'
+
+
+def test_export_gnucash_accounts(db_url):
+    accounts = export_gnucash_accounts(db_url)
+    assert accounts == [
+        HEADER,
+        ('0', 'Root Account', 'Root Account', None, None, 'ROOT', '', 0, 0),
+        ('5100', 'Expenses:Groceries', 'Groceries', 'Expenses', '50000', 'EXPENSE', 'Food', 0, 0),
+        ('10000', 'Assets', 'Assets', 'Root Account', '0', 'ASSET', 'All assets', 0, 1),
+        ('11000', 'Assets:Cash', 'Cash', 'Assets', '10000', 'CASH', '', 0, 0),
+        ('50000', 'Expenses', 'Expenses', 'Root Account', '0', 'EXPENSE', '', 0, 1),
+    ]
+
+
+def test_export_gnucash_accounts_rows_are_plain_tuples(db_url):
+    accounts = export_gnucash_accounts(db_url)
+    # Rows are copied by position, so each must line up with HEADER
+    assert all(type(row) is tuple and len(row) == len(HEADER) for row in accounts)
+
+
+def test_export_gnucash_accounts_fullnames(tmp_path):
+    path = tmp_path / 'accounts.gnucash'
+    create_accounts_db(
+        path,
+        ACCOUNTS
+        + [
+            ('template', 'Template Root', 'ROOT', None, '9000', '', 0, 0),
+            ('scheduled', 'Scheduled', 'EXPENSE', 'template', '9100', '', 0, 0),
+        ],
+    )
+    fullnames = {row[2]: row[1] for row in export_gnucash_accounts(f'sqlite:///{path}')[1:]}
+    # 'Root Account' keeps its own name, but is left out of its descendants'
+    assert fullnames['Root Account'] == 'Root Account'
+    assert fullnames['Assets'] == 'Assets'
+    assert fullnames['Cash'] == 'Assets:Cash'
+    # Any other root stays part of its descendants' fullnames
+    assert fullnames['Template Root'] == 'Template Root'
+    assert fullnames['Scheduled'] == 'Template Root:Scheduled'
@@ -0,0 +1,114 @@
+import json
+from datetime import date
+import pytest
+from transaction_processor.category_manager import CategoryManager
+from transaction_processor.process_transactions import (
+    categorize_transaction,
+    format_date,
+    parse_qif_date,
+    read_transactions_from_csv,
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """
+    Fixture to provide an unsorted CSV file, including rows sharing a date.
+    """
+    path = tmp_path / "transactions.csv"
+    path.write_text(
+        "Date,Name,Amount\n"
+        "02/01/2023,Second Payee,-50.00\n"
+        "1/5/2023,First Payee,100.00\n"
+        "02/01/2023,Third Payee,-25.00\n"
+        "12/31/2022,Oldest Payee,10.00\n"
+    )
+    return path
+
+
+@pytest.fixture
+def category_manager(tmp_path):
+    path = tmp_path / "lookup.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Assets": [],
+                "Expenses:Coffee": [["coffee", "l"]],
+                "Expenses:Dining": [["Coffee", "r"], ["^Diner #[0-9]+$", "r"]],
+            }
+        )
+    )
+    return CategoryManager(str(path), [])
+
+
+def test_categorize_transaction(category_manager):
+    assert categorize_transaction("MY COFFEE SHOP", category_manager) == "Expenses:Coffee"
+    assert categorize_transaction("Diner #12", category_manager) == "Expenses:Dining"
+    assert categorize_transaction("diner #12", category_manager) is None
+    assert categorize_transaction("Nothing", category_manager) is None
+    assert categorize_transaction("   ", category_manager) is None
+
+
+def test_categorize_transaction_prefers_lookup_file_order(category_manager):
+    # Both categories match; the first in the lookup file wins every time
+    for _ in range(200):
+        assert categorize_transaction("Coffee Shop", category_manager) == "Expenses:Coffee"
+
+
+def test_categorize_transaction_uses_new_patterns(category_manager):
+    category_manager.update_lookup("Assets", "ATM", "literal")
+    assert categorize_transaction("atm withdrawal", category_manager) == "Assets"
+    # A category that gains its first pattern keeps its place in the lookup file
+    category_manager.update_lookup("Assets", "Coffee", "literal")
+    assert categorize_transaction("Coffee Shop", category_manager) == "Assets"
+
+
+def test_read_transactions_from_csv_sorts_by_date(csv_file):
+    transactions, date_range = read_transactions_from_csv(str(csv_file), 0)
+    # Rows sharing a date keep their CSV order
+    assert [row[1] for row in transactions] == [
+        "Oldest Payee",
+        "First Payee",
+        "Second Payee",
+        "Third Payee",
+    ]
+    assert date_range == {'start': date(2022, 12, 31), 'end': date(2023, 2, 1)}
+
+
+def test_read_transactions_from_csv_without_rows(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("Date,Name,Amount\n")
+    assert read_transactions_from_csv(str(path), 0) == ([], {'start': None, 'end': None})
+
+
+def test_read_transactions_from_csv_rejects_invalid_dates(tmp_path):
+    path = tmp_path / "invalid.csv"
+    path.write_text(
+        "Date,Name,Amount\n"
+        "01/01/2023,First Payee,1.00\n"
+        "13/45/2023,Bad Payee,2.00\n"
+        "02/01/2023,Last Payee,3.00\n"
+    )
+    with pytest.raises(ValueError):
+        read_transactions_from_csv(str(path), 0)
+
+
+def test_parse_qif_date():
+    assert parse_qif_date("12/31/2021") == date(2021, 12, 31)
+    assert parse_qif_date("1/5/2023") == date(2023, 1, 5)
+    # strptime's %d also accepts a space-padded day
+    assert parse_qif_date("9/ 2/2023") == date(2023, 9, 2)
+
+
+@pytest.mark.parametrize(
+    "date_string", ["12/31/21", "02/30/2023", " 1/5/2023", "1/  5/2023", "+1/5/2023", "1/5"]
+)
+def test_parse_qif_date_rejects_invalid_dates(date_string):
+    with pytest.raises(ValueError):
+        parse_qif_date(date_string)
+
+
+def test_format_date():
+    assert format_date("1/5/2023") == "2023-01-05"
+    with pytest.raises(ValueError):
+        format_date("12/31/21")
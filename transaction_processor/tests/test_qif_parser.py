@@ -1,7 +1,6 @@
 import pytest
 from typing import LiteralString
-from transaction_processor.qif_parser import QIFParser
-from collections import OrderedDict
+from transaction_processor.qif_parser import QIFParser, Transaction
 
 
 @pytest.fixture
@@ -104,13 +103,13 @@ def test_init_from_csv(sample_csv_data, account_config):
     assert parser.transaction_type == account_config['account-type']
     assert len(parser.transactions) == 2
 
-    assert parser.transactions[0]['D'] == '01/01/2023'
-    assert parser.transactions[0]['P'] == 'Sample Payee 1'
-    assert parser.transactions[0]['T'] == '100.00'
+    assert parser.transactions[0].D == '01/01/2023'
+    assert parser.transactions[0].P == 'Sample Payee 1'
+    assert parser.transactions[0].T == '100.00'
 
-    assert parser.transactions[1]['D'] == '02/01/2023'
-    assert parser.transactions[1]['P'] == 'Sample Payee 2'
-    assert parser.transactions[1]['T'] == '-50.00'
+    assert parser.transactions[1].D == '02/01/2023'
+    assert parser.transactions[1].P == 'Sample Payee 2'
+    assert parser.transactions[1].T == '-50.00'
 
 
 @pytest.fixture
@@ -144,13 +143,12 @@ def test_parse_bank_txn(bank_txn_parser):
     assert bank_txn_parser.account_info["^"] == ""
     assert len(bank_txn_parser.transactions) == 1
     transaction = bank_txn_parser.transactions[0]
-    assert transaction['C'] == ""
-    assert transaction['D'] == "12/31/21"
-    assert transaction['N'] == "N/A"
-    assert transaction['T'] == "-100.00"
-    assert transaction['P'] == "Test Payee"
-    assert transaction['L'] == "Expenses:Misc"
-    assert transaction["^"] == ""
+    assert transaction.C == ""
+    assert transaction.D == "12/31/21"
+    assert transaction.N == "N/A"
+    assert transaction.T == "-100.00"
+    assert transaction.P == "Test Payee"
+    assert transaction.L == "Expenses:Misc"
 
 
 def test_parse_ccard_txn(ccard_txn_parser):
@@ -165,21 +163,49 @@ def test_parse_ccard_txn(ccard_txn_parser):
     assert ccard_txn_parser.account_info["^"] == ""
     assert len(ccard_txn_parser.transactions) == 2
     transaction = ccard_txn_parser.transactions[0]
-    assert transaction['C'] == ""
-    assert transaction['D'] == "11/17/2023"
-    assert transaction['N'] == "N/A"
-    assert transaction['P'] == "My Clothing Store"
-    assert transaction['T'] == "123.45"
-    assert transaction['L'] == "Expenses:Shopping:Clothing"
-    assert transaction["^"] == ""
+    assert transaction.C == ""
+    assert transaction.D == "11/17/2023"
+    assert transaction.N == "N/A"
+    assert transaction.P == "My Clothing Store"
+    assert transaction.T == "123.45"
+    assert transaction.L == "Expenses:Shopping:Clothing"
     transaction = ccard_txn_parser.transactions[1]
-    assert transaction['C'] == ""
-    assert transaction['D'] == "12/27/2023"
-    assert transaction['N'] == "N/A"
-    assert transaction['P'] == "My Grocery Store"
-    assert transaction['T'] == "123.45"
-    assert transaction['L'] == "Expenses:Food & Dining:Groceries"
-    assert transaction["^"] == ""
+    assert transaction.C == ""
+    assert transaction.D == "12/27/2023"
+    assert transaction.N == "N/A"
+    assert transaction.P == "My Grocery Store"
+    assert transaction.T == "123.45"
+    assert transaction.L == "Expenses:Food & Dining:Groceries"
+
+
+def test_parse_ignores_unknown_fields(tmp_path, sample_bank_data: LiteralString):
+    qif_file = tmp_path / "test.qif"
+    qif_file.write_text(sample_bank_data.replace("PTest Payee\n", "PTest Payee\nMA memo\n"))
+    parser = QIFParser()
+    parser.init_from_qif(str(qif_file))
+    assert len(parser.transactions) == 1
+    assert parser.transactions[0].P == "Test Payee"
+    assert not hasattr(parser.transactions[0], "M")
+
+
+def test_parse_without_account_section(tmp_path):
+    qif_file = tmp_path / "test.qif"
+    qif_file.write_text("!Type:Bank\nC\nD12/31/21\nPTest Payee\nT-100.00\n^\n")
+    parser = QIFParser()
+    parser.init_from_qif(str(qif_file))
+    assert parser.transaction_type == "Bank"
+    assert parser.account_info == {}
+    assert len(parser.transactions) == 1
+    assert parser.transactions[0].P == "Test Payee"
+
+
+def test_parse_keeps_unicode_line_separators_in_fields(tmp_path):
+    qif_file = tmp_path / "test.qif"
+    qif_file.write_text("!Type:Bank\nC\nD12/31/2021\nPTest\x0cPayee\u2028Inc\nT-100.00\n^\n")
+    parser = QIFParser()
+    parser.init_from_qif(str(qif_file))
+    assert len(parser.transactions) == 1
+    assert parser.transactions[0].P == "Test\x0cPayee\u2028Inc"
 
 
 def test_write(tmp_path, sample_csv_data, account_config):
@@ -205,18 +231,8 @@ def test_write(tmp_path, sample_csv_data, account_config):
     assert "PSample Payee 2" in content
 
 
-def test_sort_transaction():
-    txn = OrderedDict(
-        [('P', 'Test Payee'), ('T', '-100.00'), ('D', '12/31/21'), ('L', 'Expenses:Misc')]
-    )
-    sorted_txn = QIFParser.sort_transaction(txn)
-    assert list(sorted_txn.keys()) == ['D', 'P', 'T', 'L']
-
-
 def test_pretty_format():
-    txn = OrderedDict(
-        [('P', 'Test Payee'), ('T', '-100.00'), ('D', '12/31/21'), ('L', 'Expenses:Misc')]
-    )
+    txn = Transaction(P='Test Payee', T='-100.00', D='12/31/21', L='Expenses:Misc')
     formatted = QIFParser.pretty_format(txn)
     assert "D: 12/31/21" in formatted
     assert "T: -100.00" in formatted
@@ -225,9 +241,9 @@ def test_pretty_format():
 
 
 def test_categorize():
-    transaction = OrderedDict([('P', 'Test Payee'), ('T', '-100.00')])
+    transaction = Transaction(P='Test Payee', T='-100.00')
     QIFParser.categorize(transaction, "Expenses:Food")
-    assert transaction['L'] == "Expenses:Food"
+    assert transaction.L == "Expenses:Food"
 
 
 def test_init_from_qif(tmp_path, expected_qif_content: LiteralString):